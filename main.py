@@ -6,7 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict
 
-from src.rag import get_answer as fetch_qa_answer
+from src.rag import aget_answer as fetch_qa_answer
 from src.utils import get_shared_logger
 
 
@@ -84,7 +84,7 @@ async def ask_question(request: Request, payload: QuestionIn) -> AnswerOut:
 				detail="Question cannot be empty.",
 			)
 
-		answer_text = fetch_qa_answer(question)
+		answer_text = await fetch_qa_answer(question)
 		return AnswerOut(answer=answer_text)
 	except HTTPException:
 		raise
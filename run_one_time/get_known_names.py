@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
-import json
+import pickle
 import re
 from pathlib import Path
 from typing import Dict
 
-DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+import ijson
+import orjson
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = BASE_DIR / "data"
 MESSAGES_PATH = DATA_DIR / "all_messages.json"
-OUTPUT_PATH = "config/known_names.json"
+OUTPUT_PATH = BASE_DIR / "config" / "known_names.json"
+PICKLE_OUTPUT_PATH = OUTPUT_PATH.with_suffix(".pkl")
+
+_POSSESSIVE_RE = re.compile(r"['’]s$")
+_WS_RE = re.compile(r"\s+")
 
 
 def _normalize_name(value: str) -> str:
     cleaned = value.strip()
-    cleaned = re.sub(r"(?:'s|’s)$", "", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned)
+    cleaned = _POSSESSIVE_RE.sub("", cleaned)
+    cleaned = _WS_RE.sub(" ", cleaned)
     return cleaned.lower()
 
 
@@ -25,30 +33,43 @@ def build_known_names() -> Dict[str, str]:
             f"Messages file not found at {MESSAGES_PATH}. Run get_messages.py first."
         )
 
-    with MESSAGES_PATH.open("r", encoding="utf-8") as handle:
-        messages = json.load(handle)
-
     mapping: Dict[str, str] = {}
-    for item in messages:
-        user_name = item.get("user_name")
-        if not isinstance(user_name, str) or not user_name.strip():
-            continue
-        normalized = _normalize_name(user_name)
-        mapping.setdefault(normalized, user_name.strip())
+    # Stream records one at a time; only user_name is needed from each message.
+    with MESSAGES_PATH.open("rb") as handle:
+        for item in ijson.items(handle, "item"):
+            user_name = item.get("user_name")
+            if not isinstance(user_name, str) or not user_name.strip():
+                continue
+            normalized = _normalize_name(user_name)
+            mapping.setdefault(normalized, user_name.strip())
     return mapping
 
 
+def build_first_name_index(mapping: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """Map each first name to its {raw name: normalized name} entries."""
+    first_name_index: Dict[str, Dict[str, str]] = {}
+    for normalized, raw in sorted(mapping.items(), key=lambda kv: kv[1].lower()):
+        tokens = normalized.split()
+        if tokens:
+            first_name_index.setdefault(tokens[0], {}).setdefault(raw, normalized)
+    return first_name_index
+
+
 def main() -> None:
     mapping = build_known_names()
     entries = [
         {"normalized": normalized, "raw": raw}
         for normalized, raw in sorted(mapping.items(), key=lambda kv: kv[1].lower())
     ]
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(entries, handle, indent=2, ensure_ascii=False)
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_PATH.write_bytes(orjson.dumps(entries, option=orjson.OPT_INDENT_2))
     print(f"Wrote {len(entries)} unique names to {OUTPUT_PATH}")
 
+    # Pre-built lookup maps so the service can skip JSON parsing and re-indexing at startup.
+    with PICKLE_OUTPUT_PATH.open("wb") as handle:
+        pickle.dump((mapping, build_first_name_index(mapping)), handle, protocol=5)
+    print(f"Wrote name lookup maps to {PICKLE_OUTPUT_PATH}")
+
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,5 @@
 """RAG service exports."""
 
-from .service import QAService, get_answer
+from .service import QAService, aget_answer, get_answer
 
-__all__ = ["QAService", "get_answer"]
+__all__ = ["QAService", "aget_answer", "get_answer"]
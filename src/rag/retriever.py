@@ -2,37 +2,45 @@
 
 from __future__ import annotations
 
+import heapq
 import os
 import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Tuple
 import unicodedata
 
+import numpy as np
 from dotenv import load_dotenv
-from pinecone import Pinecone
+from pinecone.grpc import GRPCClientConfig, PineconeGRPC
 from fastembed import TextEmbedding
 
 from src.utils import get_shared_logger, load_config
 from src.rag.spacy_model import ensure_spacy_model
 
+import ahocorasick  # type: ignore
+import ciso8601
 import spacy  # type: ignore
 
 logger = get_shared_logger(__name__)
 
-
-def _strip_possessive(value: str) -> str:
-    return re.sub(r"(?:'s|’s)$", "", value.strip())
-
-
-def _tokenize_name(value: str) -> List[str]:
-    return [token for token in re.split(r"\W+", value.lower()) if token]
-
-
-def _normalize_question(value: str) -> str:
-    normalized = unicodedata.normalize("NFKC", value)
-    replacements = {
+_EMBED_BATCH_SIZE = 32
+_QUERY_WORKERS = 8
+_CACHE_MAX_ENTRIES = 10_000
+_NER_BATCH_SIZE = 64
+_NER_UNUSED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+_POSSESSIVE_RE = re.compile(r"['’]s$")
+_TOKEN_SPLIT_RE = re.compile(r"\W+")
+_WORD_RE = re.compile(r"\w+")
+_SENTENCE_END_RE = re.compile(r"[.!?]")
+_LEADING_PUNCT_RE = re.compile(r"^[\s\?\!\.,:;\-\u2014\u2013\"'`]+")
+_NORMALIZE_TRANS = str.maketrans(
+    {
         "\u2019": "'",
         "\u2018": "'",
         "\u2032": "'",
@@ -41,17 +49,63 @@ def _normalize_question(value: str) -> str:
         "\u201d": '"',
         "\ufffd": "'",
     }
-    for src, dst in replacements.items():
-        normalized = normalized.replace(src, dst)
-    return normalized
+)
+
+
+def _strip_possessive(value: str) -> str:
+    return _POSSESSIVE_RE.sub("", value.strip())
+
+
+def _tokenize_name(value: str) -> List[str]:
+    return [token for token in _TOKEN_SPLIT_RE.split(value.lower()) if token]
+
+
+def _normalize_question(value: str) -> str:
+    return unicodedata.normalize("NFKC", value).translate(_NORMALIZE_TRANS)
 
 
 def _strip_question_prefix(value: str) -> str:
     """Remove leading punctuation/markers that confuse NER."""
-    stripped = re.sub(r"^[\s\?\!\.,:;\-\u2014\u2013\"'`]+", "", value)
+    stripped = _LEADING_PUNCT_RE.sub("", value)
     return stripped if stripped else value
 
 
+def _is_word_boundary(text: str, position: int) -> bool:
+    return position < 0 or position >= len(text) or not text[position].isalnum()
+
+
+_MISSING = object()
+
+
+# The LRU helpers tolerate concurrent eviction so the engine can be shared across threads.
+def _lru_get(cache: "OrderedDict[str, Any]", key: str, default: Any = None) -> Any:
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        return default
+    try:
+        cache.move_to_end(key)
+    except KeyError:
+        pass
+    return value
+
+
+def _lru_put(cache: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+    cache[key] = value
+    try:
+        cache.move_to_end(key)
+        if len(cache) > _CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+    except KeyError:
+        pass
+
+
+@lru_cache(maxsize=1024)
+def _normalized_name_parts(target_name: str) -> Tuple[str, Tuple[str, ...]]:
+    """Memoized possessive strip, lowercasing and tokenisation of a member name."""
+    normalized = _strip_possessive(target_name).lower().strip()
+    return normalized, tuple(_tokenize_name(normalized))
+
+
 @dataclass
 class RetrievalResult:
     question: str
@@ -81,12 +135,33 @@ class RetrievalEngine:
             raise EnvironmentError("PINECONE_API_KEY environment variable is required.")
 
         logger.info("Initialising Pinecone client and index '%s'", self.pc_index_name)
-        self.pinecone = Pinecone(api_key=api_key)
-        self.index = self.pinecone.Index(self.pc_index_name)
+        # A persistent gRPC channel lets concurrent queries share one multiplexed connection.
+        self.pinecone = PineconeGRPC(api_key=api_key)
+        self.index = self.pinecone.Index(
+            self.pc_index_name, grpc_config=GRPCClientConfig(secure=True)
+        )
+        self._query_pool = ThreadPoolExecutor(
+            max_workers=_QUERY_WORKERS, thread_name_prefix="pinecone-query"
+        )
 
         embedder_name = self.config.get("fast_embed_name") or "BAAI/bge-small-en-v1.5"
-        logger.info("Loading FastEmbed model '%s' for query embedding", embedder_name)
-        self.embedder = TextEmbedding(model_name=embedder_name)
+        # FastEmbed already serves bge-small as an INT8-quantized ONNX graph; leave half
+        # the cores for spaCy and request handling rather than letting ORT take them all.
+        embed_threads = int(
+            self.config.get("query_embedding_threads") or max(1, (os.cpu_count() or 2) // 2)
+        )
+        logger.info(
+            "Loading FastEmbed model '%s' for query embedding (%d threads)",
+            embedder_name,
+            embed_threads,
+        )
+        self.embedder = TextEmbedding(
+            model_name=embedder_name,
+            threads=embed_threads,
+            providers=["CPUExecutionProvider"],
+        )
+        # Pay the ONNX session/tokenizer warm-up cost at startup, not on the first query.
+        next(iter(self.embedder.embed(["warm up"])))
 
         ner_model_name = self.config.get("ner_model", "en_core_web_lg")
         ner_model_version = str(self.config.get("ner_model_version", "3.7.1"))
@@ -106,17 +181,33 @@ class RetrievalEngine:
         )
         # spaCy models have a nested structure: model_path/model_name/model_name-version
         inner_model = model_path / ner_model_name / f"{ner_model_name}-{ner_model_version}"
-        if inner_model.exists():
-            self.nlp = spacy.load(str(inner_model))  # type: ignore[arg-type]
-        else:
-            self.nlp = spacy.load(str(model_path))  # type: ignore[arg-type]
+        # Only doc.ents is used; the en_core_web NER component carries its own tok2vec.
+        spacy_path = inner_model if inner_model.exists() else model_path
+        self.nlp = spacy.load(str(spacy_path), disable=_NER_UNUSED_PIPES)  # type: ignore[arg-type]
+        self._ner_pipe = self.nlp.pipe
+
+        self._embed_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._ner_cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
+        # Populated by QAService once known member names are loaded.
+        self._name_automaton: Optional[ahocorasick.Automaton] = None
+        self._known_name_tokens: AbstractSet[str] = frozenset()
+
+    def set_name_automaton(
+        self, automaton: ahocorasick.Automaton, known_tokens: AbstractSet[str]
+    ) -> None:
+        """Enable the Aho-Corasick fast path for member name extraction."""
+        self._name_automaton = automaton
+        self._known_name_tokens = known_tokens
 
     def parse_question(self, question: str) -> Tuple[str, Optional[str]]:
         normalized = _normalize_question(question).strip()
         if not normalized:
             raise ValueError("Question must not be empty.")
         ner_ready = _strip_question_prefix(normalized)
-        target_name = self._extract_target_name(ner_ready)
+        target_name = self._fast_extract_name(ner_ready)
+        if target_name is None and self._needs_ner_fallback(ner_ready):
+            target_name = self._extract_target_name(ner_ready)
         return normalized, target_name
 
     def retrieve(
@@ -126,9 +217,66 @@ class RetrievalEngine:
 
         logger.debug("Received question: %s", question)
         target_name = target_name_override or extracted_name
-        query_embedding = list(self.embedder.embed([question]))[0]
-        query_vector = query_embedding.tolist()
+        query_embedding = self._embed_questions([question])[0]
+        return self._query_index(question, target_name, query_embedding.tolist())
+
+    def retrieve_many(self, questions: List[str]) -> List[RetrievalResult]:
+        """Retrieve context for several questions with a single batched embedding pass."""
+        if not questions:
+            return []
+
+        self._prefetch_ner(questions)
+        parsed = [self.parse_question(question) for question in questions]
+        normalized_questions = [question for question, _ in parsed]
+        logger.debug("Received %d questions for batched retrieval", len(parsed))
+
+        embeddings = self._embed_questions(normalized_questions)
+        futures = [
+            self._query_pool.submit(self._query_index, question, target_name, embedding.tolist())
+            for (question, target_name), embedding in zip(parsed, embeddings)
+        ]
+        return [future.result() for future in futures]
+
+    def _embed_questions(self, questions: List[str]) -> List[np.ndarray]:
+        """Embed normalized questions, serving repeats from the LRU embedding cache."""
+        # The lowercased form is only the cache key; the embedder sees the question as
+        # asked, since fast_embed_name may point at a cased model.
+        texts = [question.strip() for question in questions]
+        keys = [text.lower() for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        missing_texts: List[str] = []
+        unique_texts: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            unique_texts.setdefault(key, text)
+        for key, text in unique_texts.items():
+            cached = _lru_get(self._embed_cache, key)
+            if cached is None:
+                missing.append(key)
+                missing_texts.append(text)
+            else:
+                vectors[key] = cached
+
+        if missing:
+            # Embed in length order so each mini-batch only pads to its own longest question,
+            # then scatter the vectors back to the original order.
+            order = np.argsort([len(text) for text in missing_texts], kind="stable")
+            inverse = np.empty_like(order)
+            inverse[order] = np.arange(len(order))
+            sorted_embeddings = list(
+                self.embedder.embed(
+                    [missing_texts[i] for i in order], batch_size=_EMBED_BATCH_SIZE
+                )
+            )
+            for i, key in enumerate(missing):
+                vectors[key] = sorted_embeddings[inverse[i]]
+                _lru_put(self._embed_cache, key, vectors[key])
 
+        return [vectors[key] for key in keys]
+
+    def _query_index(
+        self, question: str, target_name: Optional[str], query_vector: List[float]
+    ) -> RetrievalResult:
         filter_clause = self._build_metadata_filter(target_name)
         logger.debug("Query filter: %s", filter_clause)
 
@@ -157,8 +305,83 @@ class RetrievalEngine:
             top_k=self.top_k,
         )
 
+    def _fast_extract_name(self, question: str) -> Optional[str]:
+        """Return the first known member name in the question, if any.
+
+        Overlapping hits (e.g. "lily" inside "lily o'sullivan") resolve to the longest one;
+        otherwise the earliest name wins, mirroring spaCy's first PERSON entity.
+        """
+        if self._name_automaton is None:
+            return None
+
+        text = question.lower()
+        hits: List[Tuple[int, int, str]] = []
+        for end, (key, raw_name) in self._name_automaton.iter(text):
+            start = end - len(key) + 1
+            if _is_word_boundary(text, start - 1) and _is_word_boundary(text, end + 1):
+                hits.append((start, end, raw_name))
+        if not hits:
+            return None
+
+        hits.sort()
+        best_start, best_end, best_name = hits[0]
+        cluster_end = best_end
+        for start, end, raw_name in hits[1:]:
+            if start > cluster_end:
+                break
+            cluster_end = max(cluster_end, end)
+            if end - start > best_end - best_start:
+                best_start, best_end, best_name = start, end, raw_name
+
+        logger.debug("Known member name matched without NER: %s", best_name)
+        return best_name
+
+    def _needs_ner_fallback(self, question: str) -> bool:
+        """Whether the question has a capitalised, non-sentence-initial word we don't know."""
+        if self._name_automaton is None:
+            return True
+        previous_end = 0
+        for match in _WORD_RE.finditer(question):
+            token = match.group()
+            sentence_initial = previous_end == 0 or bool(
+                _SENTENCE_END_RE.search(question, previous_end, match.start())
+            )
+            previous_end = match.end()
+            if sentence_initial or token == "I" or not token[0].isupper():
+                continue
+            if token.lower() not in self._known_name_tokens:
+                return True
+        return False
+
     def _extract_target_name(self, question: str) -> Optional[str]:
-        doc = self.nlp(question)
+        cached = _lru_get(self._ner_cache, question, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        target_name = self._target_from_doc(self.nlp(question), question)
+        _lru_put(self._ner_cache, question, target_name)
+        return target_name
+
+    def _prefetch_ner(self, questions: List[str]) -> None:
+        """Run spaCy once over every question that will need the NER fallback."""
+        pending: List[str] = []
+        for question in questions:
+            normalized = _normalize_question(question).strip()
+            if not normalized:
+                continue
+            ner_ready = _strip_question_prefix(normalized)
+            if (
+                ner_ready not in self._ner_cache
+                and self._fast_extract_name(ner_ready) is None
+                and self._needs_ner_fallback(ner_ready)
+            ):
+                pending.append(ner_ready)
+
+        pending = list(dict.fromkeys(pending))
+        for question, doc in zip(pending, self._ner_pipe(pending, batch_size=_NER_BATCH_SIZE)):
+            _lru_put(self._ner_cache, question, self._target_from_doc(doc, question))
+
+    @staticmethod
+    def _target_from_doc(doc: Any, question: str) -> Optional[str]:
         entities = [(ent.text, ent.label_) for ent in doc.ents]
         logger.debug("spaCy entities detected: %s", entities or "<none>")
         for ent in doc.ents:
@@ -172,8 +395,9 @@ class RetrievalEngine:
         if not target_name:
             return None
 
-        normalized = _strip_possessive(target_name).lower().strip()
-        tokens = _tokenize_name(normalized)
+        # Only the name parsing is cached; the filter dict is rebuilt so callers can't
+        # mutate a shared copy through RetrievalResult.metadata_filter.
+        normalized, tokens = _normalized_name_parts(target_name)
 
         clauses: List[Dict[str, Any]] = []
         if normalized:
@@ -187,41 +411,67 @@ class RetrievalEngine:
         return {"$and": clauses}
 
     def _build_context(self, matches: Iterable[Any]) -> Tuple[str, List[Dict[str, Any]]]:
-        ordered: List[Tuple[Optional[datetime], int, str]] = []
-        snippets: List[Dict[str, Any]] = []
-        for idx, match in enumerate(matches):
-            if isinstance(match, dict):
-                metadata = match.get("metadata")
-            else:
-                metadata = getattr(match, "metadata", None)
+        parse_ts = self._parse_timestamp
+        get_meta = self._get_meta
+        # Column-oriented buffers: one entry per usable match, no per-row tuples or dicts.
+        parsed_ts_col: List[Optional[datetime]] = []
+        raw_ts_col: List[Any] = []
+        user_col: List[Any] = []
+        text_col: List[str] = []
+        for match in matches:
+            metadata = get_meta(match)
             if not isinstance(metadata, dict):
                 continue
 
             text = metadata.get("text") or metadata.get("message")
-            if not isinstance(text, str) or not text.strip():
+            if not isinstance(text, str):
+                continue
+            text = text.strip()
+            if not text:
                 continue
 
             raw_timestamp = metadata.get("timestamp")
-            user_name = metadata.get("user_name")
+            parsed_ts_col.append(parse_ts(raw_timestamp))
+            raw_ts_col.append(raw_timestamp)
+            user_col.append(metadata.get("user_name"))
+            text_col.append(text)
+
+        dt_max = datetime.max
+        # Size-k heap: O(n log k) instead of sorting every match and slicing.
+        perm = heapq.nsmallest(
+            self.top_k,
+            range(len(parsed_ts_col)),
+            key=lambda i: (parsed_ts_col[i] or dt_max, i),
+        )
+
+        ordered_strings: List[str] = []
+        snippets: List[Dict[str, Any]] = []
+        for i in perm:
+            raw_timestamp = raw_ts_col[i]
+            user_name = user_col[i]
+            text = text_col[i]
             display_user = user_name.strip() if isinstance(user_name, str) else "Unknown member"
-            parsed_timestamp = self._parse_timestamp(raw_timestamp)
-            timestamp_label = f"[{raw_timestamp}] " if raw_timestamp else ""
-            ordered.append((parsed_timestamp, idx, f"{timestamp_label}{display_user}: {text.strip()}"))
+            if raw_timestamp:
+                line = "".join(["[", str(raw_timestamp), "] ", display_user, ": ", text])
+            else:
+                line = "".join([display_user, ": ", text])
+            ordered_strings.append(line)
             snippets.append(
                 {
                     "timestamp": raw_timestamp,
-                    "parsed_timestamp": parsed_timestamp,
+                    "parsed_timestamp": parsed_ts_col[i],
                     "user_name": user_name,
-                    "text": text.strip(),
+                    "text": text,
                 }
             )
-
-        ordered.sort(key=lambda item: (item[0] or datetime.max, item[1]))
-
-        ordered_strings = [entry for _, _, entry in ordered[: self.top_k]]
-        snippets = snippets[: self.top_k]
         return "\n\n".join(ordered_strings), snippets
 
+    @staticmethod
+    def _get_meta(match: Any) -> Any:
+        if match.__class__ is dict:
+            return match.get("metadata", None)
+        return getattr(match, "metadata", None)
+
     @staticmethod
     def _parse_timestamp(value: Any) -> Optional[datetime]:
         if value is None:
@@ -235,12 +485,12 @@ class RetrievalEngine:
             return None
 
         candidate = value.strip()
-        if not candidate:
+        # Every supported format starts with a digit; reject empty/garbage before parsing.
+        if not candidate or not candidate[0].isdigit():
             return None
 
-        candidate_iso = candidate.replace("Z", "+00:00")
         try:
-            parsed = datetime.fromisoformat(candidate_iso)
+            parsed = ciso8601.parse_datetime(candidate)
             if parsed.tzinfo is not None:
                 return parsed.astimezone(timezone.utc).replace(tzinfo=None)
             return parsed
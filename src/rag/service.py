@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import os
+import pickle
 import re
+import threading
 from collections import defaultdict
-from difflib import get_close_matches
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+import ahocorasick  # type: ignore
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from rapidfuzz import fuzz, process
+from urllib3.util.retry import Retry
 
-from src.rag.retriever import RetrievalEngine, RetrievalResult
+from src.rag.retriever import RetrievalEngine, RetrievalResult, _tokenize_name
 from src.utils import get_shared_logger
 
 logger = get_shared_logger(__name__)
@@ -21,6 +27,12 @@ logger = get_shared_logger(__name__)
 
 BASE_DIR = Path(__file__).parent.parent.parent
 KNOWN_NAMES_PATH = BASE_DIR / "config" / "known_names.json"
+KNOWN_NAMES_PICKLE_PATH = KNOWN_NAMES_PATH.with_suffix(".pkl")
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+_POSSESSIVE_RE = re.compile(r"['’]s$")
+_WS_RE = re.compile(r"\s+")
+_NEXT_SECTION_RE = re.compile(r"\n[ \t*#-]*reasoning:", re.IGNORECASE)
+
 @dataclass
 class MemberResolution:
     display_name: Optional[str]
@@ -30,12 +42,37 @@ class MemberResolution:
 
 def _normalize_member_name(value: str) -> str:
     cleaned = value.strip()
-    cleaned = re.sub(r"(?:'s|’s)$", "", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned)
+    cleaned = _POSSESSIVE_RE.sub("", cleaned)
+    cleaned = _WS_RE.sub(" ", cleaned)
     return cleaned.lower()
 
 
-def _load_known_names() -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+def _load_known_names_pickle() -> Optional[Tuple[Dict[str, str], Dict[str, Dict[str, str]]]]:
+    """Return the pre-built name maps if a pickle at least as new as the JSON exists."""
+    # The JSON is the source of truth; without it there is nothing to prove the pickle fresh.
+    if not KNOWN_NAMES_PICKLE_PATH.exists() or not KNOWN_NAMES_PATH.exists():
+        return None
+    if KNOWN_NAMES_PICKLE_PATH.stat().st_mtime < KNOWN_NAMES_PATH.stat().st_mtime:
+        logger.info("Known names pickle is older than %s; ignoring it", KNOWN_NAMES_PATH)
+        return None
+
+    try:
+        with KNOWN_NAMES_PICKLE_PATH.open("rb") as handle:
+            normalized_map, first_name_index = pickle.load(handle)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError) as exc:
+        logger.warning("Failed to load known names pickle, falling back to JSON: %s", exc)
+        return None
+    if not all(isinstance(raw_names, dict) for raw_names in first_name_index.values()):
+        logger.warning("Known names pickle uses an outdated layout; falling back to JSON")
+        return None
+    return normalized_map, first_name_index
+
+
+def _load_known_names() -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+    cached = _load_known_names_pickle()
+    if cached is not None:
+        return cached
+
     if not KNOWN_NAMES_PATH.exists():
         logger.warning(
             "Known names file missing at %s. Run run_one_time/get_known_names.py to generate it.",
@@ -44,13 +81,13 @@ def _load_known_names() -> Tuple[Dict[str, str], Dict[str, List[str]]]:
         return {}, {}
 
     try:
-        raw_entries = json.loads(KNOWN_NAMES_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
+        raw_entries = orjson.loads(KNOWN_NAMES_PATH.read_bytes())
+    except orjson.JSONDecodeError as exc:
         logger.error("Failed to parse known names file: %s", exc)
         return {}, {}
 
     normalized_map: Dict[str, str] = {}
-    first_name_index: Dict[str, List[str]] = defaultdict(list)
+    first_name_index: Dict[str, Dict[str, str]] = defaultdict(dict)
     for entry in raw_entries:
         raw_name = entry.get("raw")
         normalized_name = entry.get("normalized")
@@ -61,12 +98,28 @@ def _load_known_names() -> Tuple[Dict[str, str], Dict[str, List[str]]]:
             if isinstance(normalized_name, str) and normalized_name.strip()
             else _normalize_member_name(raw_name)
         )
-        normalized_map.setdefault(normalized, raw_name.strip())
+        raw_stripped = raw_name.strip()
+        normalized_map.setdefault(normalized, raw_stripped)
         first_token = normalized.split()[0] if normalized else ""
         if first_token:
-            if raw_name.strip() not in first_name_index[first_token]:
-                first_name_index[first_token].append(raw_name.strip())
-    return normalized_map, first_name_index
+            first_name_index[first_token].setdefault(raw_stripped, normalized)
+    return normalized_map, dict(first_name_index)
+
+
+def _build_name_automaton(
+    normalized_map: Dict[str, str], first_name_index: Dict[str, Dict[str, str]]
+) -> ahocorasick.Automaton:
+    """Compile known full names and first names into a single Aho-Corasick automaton."""
+    automaton = ahocorasick.Automaton()
+    for first_token, raw_names in first_name_index.items():
+        # Ambiguous first names map to the bare token so resolution can suggest options.
+        first_raw = next(iter(raw_names))
+        raw = first_raw if len(raw_names) == 1 else first_raw.split()[0]
+        automaton.add_word(first_token, (first_token, raw))
+    for normalized, raw in normalized_map.items():
+        automaton.add_word(normalized, (normalized, raw))
+    automaton.make_automaton()
+    return automaton
 
 
 def _load_text_file(path: Path, fallback: str) -> str:
@@ -122,12 +175,42 @@ class QAService:
                 "GROQ_API_KEY environment variable is required for LLM generation."
             )
 
+        # One pooled keep-alive session so repeated questions skip the TCP/TLS handshake.
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {self.groq_api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("https://", adapter)
+
         self.system_prompt = _load_system_prompt()
         self.message_template = _load_user_template()
         (
             self.known_names_map,
             self.first_name_index,
         ) = _load_known_names()
+        self._known_names_keys_tuple: Tuple[str, ...] = tuple(self.known_names_map.keys())
+        if self.known_names_map:
+            known_tokens = frozenset(
+                token for normalized in self.known_names_map for token in _tokenize_name(normalized)
+            )
+            self.retriever.set_name_automaton(
+                _build_name_automaton(self.known_names_map, self.first_name_index),
+                known_tokens,
+            )
         logger.info("Using Groq model '%s' for generation", self.groq_model)
 
     def get_answer(self, question: str) -> str:
@@ -148,6 +231,18 @@ class QAService:
             retrieval=retrieval,
         )
 
+    async def aget_answer(self, question: str) -> str:
+        """Answer a question without blocking the event loop.
+
+        Embedding, NER and the Pinecone/Groq calls all release the GIL, so running the
+        pipeline in a worker thread lets concurrent questions overlap their stages.
+        """
+        return await asyncio.to_thread(self.get_answer, question)
+
+    async def aget_answers(self, questions: List[str]) -> List[str]:
+        """Answer several questions concurrently, preserving input order."""
+        return list(await asyncio.gather(*(self.aget_answer(q) for q in questions)))
+
     def _call_groq(self, question: str, context: str, retrieval: RetrievalResult) -> str:
         """Call Groq API using OpenAI-compatible chat completions format."""
         context_section = context if context else "No relevant context was retrieved."
@@ -174,39 +269,25 @@ class QAService:
             }
         ]
 
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
-        
         payload = {
             "model": self.groq_model,
             "messages": messages,
             "temperature": 0.2,
             "max_tokens": 256,
             "top_p": 0.9,
+            "stream": True,
         }
 
         try:
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=30,
-            )
-
-            if response.status_code >= 400:
-                raise RuntimeError(
-                    f"Groq API request failed: {response.status_code} - {response.text}"
-                )
+            with self._session.post(
+                GROQ_URL, data=orjson.dumps(payload), timeout=30, stream=True
+            ) as response:
+                if response.status_code >= 400:
+                    raise RuntimeError(
+                        f"Groq API request failed: {response.status_code} - {response.text}"
+                    )
+                message_content = self._read_streamed_content(response)
 
-            data = response.json()
-            
-            if "choices" not in data or not data["choices"]:
-                raise RuntimeError("Groq API returned no choices.")
-            
-            message_content = data["choices"][0].get("message", {}).get("content")
-            
             if not message_content:
                 raise RuntimeError("Groq API returned no content.")
             
@@ -228,6 +309,50 @@ class QAService:
             logger.error("Groq API request failed: %s", exc)
             raise RuntimeError(f"Failed to communicate with Groq API: {exc}") from exc
 
+    @staticmethod
+    def _read_streamed_content(response: requests.Response) -> str:
+        """Accumulate streamed completion deltas, stopping once the answer section is complete."""
+        marker = "answer:"
+        buffer = ""
+        for line in response.iter_lines():
+            if not line.startswith(b"data:"):
+                continue
+            data = line[len(b"data:") :].strip()
+            if data == b"[DONE]":
+                break
+            try:
+                chunk = orjson.loads(data)
+            except orjson.JSONDecodeError as exc:
+                raise RuntimeError(f"Groq API returned invalid JSON: {exc}") from exc
+            if "error" in chunk:
+                raise RuntimeError(f"Groq API stream failed: {chunk['error']}")
+
+            choices = chunk.get("choices")
+            if not choices:
+                continue
+            delta = choices[0].get("delta", {}).get("content")
+            if not delta:
+                continue
+            buffer += delta
+
+            lowered = buffer.lower()
+            idx = lowered.rfind(marker)
+            if idx == -1:
+                continue
+            line_start = lowered.rfind("\n", 0, idx) + 1
+            if lowered[line_start:idx].strip(" \t*#-"):
+                # "answer:" mid-sentence is not the final answer label.
+                continue
+            answer_start = idx + len(marker)
+            next_section = _NEXT_SECTION_RE.search(buffer, answer_start)
+            if next_section and buffer[answer_start : next_section.start()].strip():
+                # Answers may span several lines (e.g. lists), so only a new section header
+                # proves the answer is finished; otherwise the stream is read to [DONE].
+                logger.debug("Closing Groq stream after the answer section")
+                response.close()
+                return buffer[: next_section.start()]
+        return buffer
+
     @staticmethod
     def _build_context_summary(retrieval: RetrievalResult) -> Dict[str, str]:
         member_name = retrieval.target_name or "Name not explicitly mentioned; assume the member in the question."
@@ -260,10 +385,10 @@ class QAService:
         tokens = normalized.split()
         if tokens:
             first_token = tokens[0]
-            matches = self.first_name_index.get(first_token, [])
+            matches = self.first_name_index.get(first_token, {})
             if len(matches) == 1:
-                match = matches[0]
-                return MemberResolution(match, _normalize_member_name(match), None)
+                match_raw, match_normalized = next(iter(matches.items()))
+                return MemberResolution(match_raw, match_normalized, None)
 
         suggestions = self._suggest_names(normalized)
         message = self._format_invalid_name_message(suggestions)
@@ -286,9 +411,14 @@ class QAService:
     def _suggest_names(self, normalized: str, limit: int = 5) -> List[str]:
         if not normalized or not self.known_names_map:
             return []
-        candidates = list(self.known_names_map.keys())
-        matches = get_close_matches(normalized, candidates, n=limit, cutoff=0.5)
-        return [self.known_names_map[match] for match in matches]
+        matches = process.extract(
+            normalized,
+            self._known_names_keys_tuple,
+            scorer=fuzz.ratio,
+            limit=limit,
+            score_cutoff=50,
+        )
+        return [self.known_names_map[match] for match, _score, _idx in matches]
 
     @staticmethod
     def _format_invalid_name_message(suggestions: List[str]) -> str:
@@ -298,12 +428,15 @@ class QAService:
 
 
 _qa_service: Optional[QAService] = None
+_qa_service_lock = threading.Lock()
 
 
 def _get_service() -> QAService:
     global _qa_service
     if _qa_service is None:
-        _qa_service = QAService()
+        with _qa_service_lock:
+            if _qa_service is None:
+                _qa_service = QAService()
     return _qa_service
 
 
@@ -311,3 +444,9 @@ def get_answer(question: str) -> str:
     """Return an answer for the supplied question."""
     service = _get_service()
     return service.get_answer(question)
+
+
+async def aget_answer(question: str) -> str:
+    """Return an answer for the supplied question without blocking the event loop."""
+    service = await asyncio.to_thread(_get_service)
+    return await service.aget_answer(question)
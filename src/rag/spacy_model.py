@@ -2,21 +2,30 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 import shutil
 import tarfile
 import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import requests
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None  # type: ignore[assignment]
+
 from src.utils import get_shared_logger
 
 logger = get_shared_logger(__name__)
 
 _BASE_URL = "https://github.com/explosion/spacy-models/releases/download"
 _STORAGE_ENV = "SPACY_MODEL_DIR"
+_CHUNK_SIZE = 1_048_576
+_INTEGRITY_FILE = ".integrity"
 
 
 class SpaCyModelDownloadError(RuntimeError):
@@ -64,24 +73,20 @@ def ensure_spacy_model(
         archive_url,
     )
 
+    # Use the storage directory for temporary files to avoid /tmp space limits.
+    # The archive lives outside the TemporaryDirectory so a failed run can resume it;
+    # the URL hash in its name keeps a changed ner_model_url from resuming stale bytes.
+    temp_base = resolved_storage / ".tmp"
+    url_key = hashlib.sha256(archive_url.encode("utf-8")).hexdigest()[:12]
+    archive_path = temp_base / f"{model_name}-{version_label}-{url_key}.tar.gz"
     try:
-        # Use the storage directory for temporary files to avoid /tmp space limits
-        temp_base = resolved_storage / ".tmp"
         temp_base.mkdir(parents=True, exist_ok=True)
-        with tempfile.TemporaryDirectory(dir=temp_base) as tmpdir:
-            temp_dir = Path(tmpdir)
-            archive_path = temp_dir / "model.tar.gz"
-            _download_file(archive_url, archive_path)
-
-            extract_root = temp_dir / "extract"
-            extract_root.mkdir(parents=True, exist_ok=True)
-            with tarfile.open(archive_path, "r:gz") as tar:
-                tar.extractall(extract_root)
-
-            model_root = _find_model_root(extract_root)
-            if target_dir.exists():
-                shutil.rmtree(target_dir)
-            shutil.move(str(model_root), target_dir)
+        # Workers sharing a storage volume must not write the same .part file at once.
+        with _exclusive_lock(temp_base / f"{model_name}-{version_label}.lock"):
+            if meta_file.exists():
+                logger.info("spaCy model was installed by another process at %s", target_dir)
+                return target_dir
+            _install_archive(archive_url, archive_path, target_dir)
     except Exception as exc:  # noqa: BLE001 - surface full context to caller
         raise SpaCyModelDownloadError(
             f"Failed to download spaCy model '{model_name}' ({version_label}): {exc}"
@@ -91,20 +96,135 @@ def ensure_spacy_model(
     return target_dir
 
 
+def _install_archive(archive_url: str, archive_path: Path, target_dir: Path) -> None:
+    temp_base = archive_path.parent
+    digest = _download_file(archive_url, archive_path)
+
+    try:
+        with tempfile.TemporaryDirectory(dir=temp_base) as tmpdir:
+            extract_root = Path(tmpdir) / "extract"
+            extract_root.mkdir(parents=True, exist_ok=True)
+            _extract_archive(archive_path, extract_root)
+
+            model_root = _find_model_root(extract_root)
+            if target_dir.exists():
+                shutil.rmtree(target_dir)
+            shutil.move(str(model_root), target_dir)
+    except Exception:
+        # The sidecar only records what arrived, not what upstream published, so a
+        # bad archive must be discarded or every later start would reuse it.
+        _discard_archive(archive_path)
+        raise
+
+    (target_dir / _INTEGRITY_FILE).write_text(f"sha256:{digest}\n", encoding="utf-8")
+    _discard_archive(archive_path)
+
+
+@contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """Hold an advisory cross-process lock on ``lock_path`` (no-op without fcntl)."""
+    with lock_path.open("a") as handle:
+        if fcntl is None:
+            yield
+            return
+        logger.debug("Waiting for lock %s", lock_path)
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
 def _build_default_url(model_name: str, version: str | None) -> str:
     if not version:
         raise ValueError("Model version is required when no explicit download URL is provided.")
     return f"{_BASE_URL}/{model_name}-{version}/{model_name}-{version}.tar.gz"
 
 
-def _download_file(url: str, destination: Path) -> None:
-    with requests.get(url, stream=True, timeout=120) as response:
+def _download_file(url: str, destination: Path) -> str:
+    """Download ``url`` to ``destination``, resuming a partial file, and return its SHA256."""
+    checksum_path = _checksum_path(destination)
+    if destination.exists() and checksum_path.exists():
+        digest = _hash_file(destination).hexdigest()
+        if digest == checksum_path.read_text(encoding="utf-8").strip():
+            logger.info("Reusing verified archive at %s", destination)
+            return digest
+        logger.warning("Checksum mismatch for %s; downloading it again", destination)
+        destination.unlink()
+
+    partial = destination.with_name(destination.name + ".part")
+    offset = partial.stat().st_size if partial.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    with requests.get(url, stream=True, timeout=120, headers=headers) as response:
+        if offset and response.status_code == 416:
+            # The partial file does not line up with the remote archive; start over.
+            partial.unlink()
+            return _download_file(url, destination)
         response.raise_for_status()
-        with destination.open("wb") as handle:
-            for chunk in response.iter_content(chunk_size=1_048_576):
+
+        if offset and response.status_code == 206:
+            if _content_range_start(response.headers.get("Content-Range")) != offset:
+                logger.warning("Server did not resume %s at byte %d; starting over", url, offset)
+                response.close()
+                partial.unlink()
+                return _download_file(url, destination)
+            logger.info("Resuming download of %s at byte %d", url, offset)
+            hasher = _hash_file(partial)
+            mode = "ab"
+        else:
+            hasher = hashlib.sha256()
+            mode = "wb"
+
+        with partial.open(mode) as handle:
+            for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
                 if chunk:
+                    hasher.update(chunk)
                     handle.write(chunk)
 
+    partial.replace(destination)
+    digest = hasher.hexdigest()
+    checksum_path.write_text(digest, encoding="utf-8")
+    return digest
+
+
+def _checksum_path(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name + ".sha256")
+
+
+def _discard_archive(archive_path: Path) -> None:
+    archive_path.unlink(missing_ok=True)
+    archive_path.with_name(archive_path.name + ".part").unlink(missing_ok=True)
+    _checksum_path(archive_path).unlink(missing_ok=True)
+
+
+def _content_range_start(header: Optional[str]) -> Optional[int]:
+    # Expected form: "bytes <start>-<end>/<total>".
+    if not header or not header.startswith("bytes "):
+        return None
+    start, _, _ = header[len("bytes ") :].partition("-")
+    try:
+        return int(start)
+    except ValueError:
+        return None
+
+
+def _hash_file(path: Path) -> "hashlib._Hash":
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher
+
+
+def _extract_archive(archive_path: Path, extract_root: Path) -> None:
+    # Streaming mode reads the gzip once front-to-back without building a seekable index.
+    with tarfile.open(archive_path, "r|gz") as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(extract_root, filter="data")
+        else:
+            tar.extractall(extract_root)  # noqa: S202 - Python without extraction filters
+
 
 def _find_model_root(extracted_root: Path) -> Path:
     candidates = [path.parent for path in extracted_root.rglob("meta.json")]